@@ -3,25 +3,44 @@ __version__ = "1.0.0"
 import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
-from PIL import Image
+import numpy as np
 import base64 
+import csv
+import random
 from io import BytesIO
 
 GLOSSARY_DATA = "data/glossary.csv"
 VIVA_DATA = "data/viva.csv"
 LOGO_IMG = "images/logo.png"
 
+# Explicit dtypes for the viva.csv header, so read_csv skips type inference
+QA_DTYPES = {
+    'Section': 'category',
+    'Question Number': 'int32',
+    'Question': str,
+    'Answer': str
+}
+
 
 st.set_page_config(page_title="Viva Q&A Review", layout="wide")
 
+@st.cache_resource(show_spinner=False)
 def load_qa_data(file_data):
     """
     Load Q&A data from CSV file or file object
     Returns DataFrame or None if loading fails
+    Shared across reruns and sessions without copying - callers must not
+    mutate the returned DataFrame; selections are row positions into it
     """
     try:
-        # Handle both file paths and file objects
-        df = pd.read_csv(file_data, encoding='cp1252')
+        # Handle both file paths and file objects - only paths can be memory-mapped
+        df = pd.read_csv(
+            file_data,
+            encoding='utf-8',
+            engine='c',
+            memory_map=isinstance(file_data, str),
+            dtype=QA_DTYPES
+        )
         
         # Handle the 4-column structure: Section, Question Number, Question, Answer
         if 'Question Number' in df.columns:
@@ -30,43 +49,84 @@ def load_qa_data(file_data):
             df.columns = ['Section', 'question_num', 'Question', 'Answer']
         elif len(df.columns) == 3:
             df.columns = ['question_num', 'Question', 'Answer']
+
+        # Categories keep first-appearance order, matching the default section order
+        if 'Section' in df.columns:
+            df['Section'] = pd.Categorical(df['Section'], categories=df['Section'].drop_duplicates().tolist())
             
         return df
     except Exception as e:
         return None
 
+@st.cache_resource(show_spinner=False)
 def load_glossary_data(file_data):
     """
-    Load Glossary data from CSV file
-    Returns DataFrame or None if loading fails
+    Load Glossary data from CSV file as a list of (term, definition) rows
+    The glossary is only ever rendered as HTML, so it skips pandas entirely
+    Returns list or None if loading fails
+    Shared across reruns and sessions - callers must not mutate the list
     """
     try:
-        df = pd.read_csv(file_data, encoding='utf-8')
-        return df
+        with open(file_data, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            term_col, definition_col = header.index('Term'), header.index('Definition')
+            return [(row[term_col], row[definition_col]) for row in reader if row]
     except Exception as e:
         return None
 
-def show_header():
+@st.cache_data(show_spinner=False)
+def question_order(df_id, selected):
     """
-    Display the common header for both tabs    
+    Row positions into the Q&A data for the selected sections, ordered by
+    selection order and then question number
+    Keyed on the data path and selection tuple, so navigation reruns that
+    leave the selection unchanged skip the rebuild
     """
-    col_title, col_logo = st.columns(2, border=False, vertical_alignment="center")
-    with col_title:
-        st.title(":blue[PhD Viva Q&A]")    
-        
-    with col_logo:
-        try:
-            # Load the image that works
-            image = Image.open(LOGO_IMG)
+    df = load_qa_data(df_id)
 
-            # Convert to base64 for the HTML
-            buffered = BytesIO()
-            image.save(buffered, format="PNG")
-            img_str = base64.b64encode(buffered.getvalue()).decode()
+    # Filter on the integer category codes rather than the section strings -
+    # kind='table' turns the membership test into a lookup over the small code range
+    cat = df['Section'].cat
+    codes = cat.codes.to_numpy()
+    sel_codes = np.asarray([cat.categories.get_loc(s) for s in selected], dtype=codes.dtype)
+    rows = np.flatnonzero(np.isin(codes, sel_codes, kind='table'))
+
+    # Reorder based on selection order - lexsort uses the last key as primary
+    rank_by_code = np.zeros(len(cat.categories), dtype=np.int32)
+    rank_by_code[sel_codes] = np.arange(len(sel_codes), dtype=np.int32)
+    section_rank = rank_by_code[codes[rows]]
+    question_num = df['question_num'].to_numpy()[rows]
+    return rows[np.lexsort((question_num, section_rank))].astype(np.int32)
+
+QUESTION_BLOCK = """### {section}  Q{question_num}
+
+**:blue[{question}]**
+
+### Answer:
+
+*{answer}*
+"""
+
+@st.cache_resource(show_spinner=False)
+def question_blocks(df_id):
+    """
+    Pre-rendered Markdown for every question, indexed by row position in the
+    Q&A data, so a navigation click is a single list lookup
+    Shared without copying - callers must not mutate the list
+    """
+    df = load_qa_data(df_id)
+    return [
+        QUESTION_BLOCK.format(section=section, question_num=question_num, question=question, answer=answer)
+        for section, question_num, question, answer in zip(
+            df['Section'].to_numpy(),
+            df['question_num'].to_numpy(),
+            df['Question'].to_numpy(),
+            df['Answer'].to_numpy()
+        )
+    ]
 
-            # Use in markdown with link
-            st.markdown(
-                f'''<a href="https://thinkingml.com" style="
+LOGO_LINK_STYLE = """
                     font-family: inherit;
                     font-weight: 500;
                     text-decoration: none;
@@ -75,28 +135,77 @@ def show_header():
                     align-items: center;
                     gap: 0.5rem;
                     color: #5f6f8c !important;
-                ">
-                <img src="data:image/png;base64,{img_str}" width="40" />  thinkingML</a>''', 
-                unsafe_allow_html=True)
-            
-        except Exception:
+                """
+
+@st.cache_resource(show_spinner=False)
+def logo_html():
+    """
+    Build the linked logo HTML once per process
+    The logo is already a PNG, so its bytes are embedded as-is; any other
+    format is re-encoded to PNG first
+    """
+    try:
+        with open(LOGO_IMG, "rb") as f:
+            raw = f.read()
+
+        if not raw.startswith(b"\x89PNG\r\n\x1a\n"):
+            # Pillow is only needed for this cold-start fallback, so import it lazily
+            from PIL import Image
+
+            buffered = BytesIO()
+            Image.open(BytesIO(raw)).save(buffered, format="PNG")
+            raw = buffered.getvalue()
+
+        img_str = base64.b64encode(raw).decode()
+        return f'''<a href="https://thinkingml.com" style="{LOGO_LINK_STYLE}">
+                <img src="data:image/png;base64,{img_str}" width="40" />  thinkingML</a>'''
+
+    except Exception:
         # Fallback to styled text if image loading fails
-            st.markdown(
-                '''
-                <a href="https://thinkingml.com" style="
-                    font-family: inherit;
-                    font-weight: 500;
-                    text-decoration: none;
-                    font-size: 1.25rem;
-                    display: inline-flex;
-                    align-items: center;
-                    gap: 0.5rem;
-                    color: #5f6f8c !important;
-                ">thinkingML</a>
-                ''',
-                unsafe_allow_html=True
-            )
+        return f'''<a href="https://thinkingml.com" style="{LOGO_LINK_STYLE}">thinkingML</a>'''
+
+def show_header():
+    """
+    Display the common header for both tabs    
+    """
+    col_title, col_logo = st.columns(2, border=False, vertical_alignment="center")
+    with col_title:
+        st.title(":blue[PhD Viva Q&A]")    
+        
+    with col_logo:
+        st.markdown(logo_html(), unsafe_allow_html=True)
+
+
+def go_first(n):
+    """Navigation callback - jump to the first of n questions"""
+    st.session_state.current_index = 0
 
+def go_previous(n):
+    """Navigation callback - step back one question"""
+    if st.session_state.current_index > 0:
+        st.session_state.current_index -= 1
+
+def go_next(n):
+    """Navigation callback - step forward one question, stopping at n - 1"""
+    if st.session_state.current_index < n - 1:
+        st.session_state.current_index += 1
+
+def go_last(n):
+    """Navigation callback - jump to the last of n questions"""
+    st.session_state.current_index = n - 1
+
+def go_random(n):
+    """Navigation callback - jump to a random one of n questions"""
+    st.session_state.current_index = random.randrange(n)
+
+MULTISELECT_CSS = """
+    <style>
+        [data-testid="stMultiSelect"] span {
+            background: slategrey !important;
+            font-weight: 500 !important;
+        }
+    </style>
+    """
 
 def viva_tab():
     """
@@ -108,28 +217,20 @@ def viva_tab():
     df = load_qa_data(VIVA_DATA)
     
     if df is not None and not df.empty:
-        total_sections = len(df['Section'].unique())            
+        # Categories are already unique and in first-appearance order
+        all_sections = df['Section'].cat.categories.tolist()
+        total_sections = len(all_sections)
         
         # Initialize session state
         if 'current_index' not in st.session_state:
             st.session_state.current_index = 0
                 
         # Section filtering - moved up before any navigation
-        st.markdown("""
-            <style>
-                [data-testid="stMultiSelect"] span {
-                    background: slategrey !important;
-                    font-weight: 500 !important;
-                }
-            </style>
-            """, unsafe_allow_html=True)
-        
         # Get current selection from session state
-        current_sections = st.session_state.get('selected_sections', df['Section'].unique().tolist())            
+        current_sections = st.session_state.get('selected_sections', all_sections)            
         filter_text = "🔍 Filter Sections"
 
         with st.expander(filter_text):
-            all_sections = df['Section'].unique().tolist()
             selected_sections = st.multiselect(
                 "Select sections to include:",
                 options=all_sections,
@@ -140,25 +241,22 @@ def viva_tab():
             # Update session state
             st.session_state.selected_sections = selected_sections
             
-            # Create filtered and ordered dataframe
+            # Ordered row positions for the selection - indexes df directly.
+            # Kept per session by selection so clicks skip the cache_data hashing
             if selected_sections:
-                # Filter the dataframe
-                filtered_df = df[df['Section'].isin(selected_sections)].copy()
-                # Reorder based on selection order
-                filtered_df['section_order'] = pd.Categorical(
-                    filtered_df['Section'], 
-                    categories=selected_sections, 
-                    ordered=True
-                )
-                filtered_df = filtered_df.sort_values(['section_order', 'question_num']).drop('section_order', axis=1).reset_index(drop=True)
+                selection_key = tuple(selected_sections)
+                idx_cache = st.session_state.setdefault('idx_cache', {})
+                if selection_key not in idx_cache:
+                    idx_cache[selection_key] = question_order(VIVA_DATA, selection_key)
+                idx_array = idx_cache[selection_key]
             else:
-                filtered_df = pd.DataFrame()  # Empty dataframe when nothing selected
+                idx_array = np.empty(0, dtype=np.int32)  # Nothing selected
             
         # Show status info
-        st.info(f"Showing {len(filtered_df)} of {len(df)} questions ({len(selected_sections)}/{total_sections})")
+        st.info(f"Showing {len(idx_array)} of {len(df)} questions ({len(selected_sections)}/{total_sections})")
         
         # Handle empty filtered results
-        if len(filtered_df) == 0:
+        if len(idx_array) == 0:
             st.warning("No questions to display. Please select at least one section.")
             # Show disabled navigation buttons
             col1, col2, col3, col4, col5 = st.columns(5)
@@ -175,58 +273,108 @@ def viva_tab():
             return
         
         # Adjust current_index if it's beyond filtered results
-        if st.session_state.current_index >= len(filtered_df):
-            st.session_state.current_index = len(filtered_df) - 1
+        if st.session_state.current_index >= len(idx_array):
+            st.session_state.current_index = len(idx_array) - 1
         
-        # Progress indicator (using filtered dataframe)
-        progress = (st.session_state.current_index + 1) / len(filtered_df)
-        st.progress(progress, text=f"Question {st.session_state.current_index + 1} of {len(filtered_df)}")
+        # Progress indicator (using the selection)
+        progress = (st.session_state.current_index + 1) / len(idx_array)
+        st.progress(progress, text=f"Question {st.session_state.current_index + 1} of {len(idx_array)}")
         
         # Navigation buttons
         col1, col2, col3, col4, col5 = st.columns(5)
         
+        # Callbacks update the index before the rerun, so no st.rerun() is needed
+        n = len(idx_array)
         with col1:
-            if st.button("⏮ First"):
-                st.session_state.current_index = 0                
-                st.rerun()
+            st.button("⏮ First", on_click=go_first, args=(n,))
         
         with col2:
-            if st.button("⏪ Previous"):
-                if st.session_state.current_index > 0:
-                    st.session_state.current_index -= 1                    
-                    st.rerun()
+            st.button("⏪ Previous", on_click=go_previous, args=(n,))
         
         with col3:
-            if st.button("⏩ Next"):
-                if st.session_state.current_index < len(filtered_df) - 1:
-                    st.session_state.current_index += 1                    
-                    st.rerun()
+            st.button("⏩ Next", on_click=go_next, args=(n,))
         
         with col4:
-            if st.button("⏭ Last"):
-                st.session_state.current_index = len(filtered_df) - 1                
-                st.rerun()
+            st.button("⏭ Last", on_click=go_last, args=(n,))
         
         with col5:
-            if st.button("🔀 Random"):
-                import random
-                st.session_state.current_index = random.randint(0, len(filtered_df) - 1)                
-                st.rerun()
+            st.button("🔀 Random", on_click=go_random, args=(n,))
         
-        # Current question (from filtered dataframe)
-        current_row = filtered_df.iloc[st.session_state.current_index]
-        
-        st.markdown(f"### {current_row.get('Section', st.session_state.current_index + 1)}  Q{current_row.get('question_num', st.session_state.current_index + 1)}")
-        st.markdown(f"**:blue[{current_row['Question']}]**")
-
-        st.markdown("### Answer:")
-        st.markdown(f"*{current_row['Answer']}*")
+        # Current question (position within the selection)
+        blocks = question_blocks(VIVA_DATA)
+        st.markdown(blocks[idx_array[st.session_state.current_index]])
         
         st.markdown("---")
         
     else:
         st.error("⚠️ Could not load viva data")
 
+# custom-table - simple and effective
+GLOSSARY_TABLE_HEADER = """
+        <style>
+            .glossary-table {
+                width: 100%;
+                border-collapse: collapse;
+                font-family: Arial, sans-serif;
+            }
+            .glossary-table th {
+                background-color: #f0f2f6;
+                font-weight: bold;
+                padding: 8px;
+                text-align: left;
+                border-bottom: 2px solid #e6e6e6;
+            }
+            .glossary-table td {
+                padding: 8px;
+                border-bottom: 1px solid #e6e6e6;
+                word-wrap: break-word;
+            }
+            .glossary-table tr:nth-child(even) {
+                background-color: #f8f9fa;
+            }
+            .term-column {
+                color: darkslategrey;
+                
+            }
+            .definition-column {
+                color: slategrey;
+            }
+        </style>
+
+        <table class='glossary-table'>
+            <tr>
+                <th>Term</th>
+                <th>Definition</th>
+            </tr>
+        """
+
+GLOSSARY_HEIGHT = 500  # fixed iframe height - the table scrolls within it
+
+GLOSSARY_ROW = """
+            <tr>
+                <td class='term-column'>{term}</td>
+                <td class='definition-column'>{definition}</td>
+            </tr>
+        """
+
+def build_table_html(entries):
+    """
+    Render the glossary (term, definition) rows as the custom-styled HTML table
+    """
+    rows = "".join(
+        GLOSSARY_ROW.format(term=term, definition=definition)
+        for term, definition in entries
+    )
+    return GLOSSARY_TABLE_HEADER + rows + "</table>"
+
+@st.cache_resource(show_spinner=False)
+def glossary_html(file_data):
+    """
+    Cached glossary table HTML - deterministic from the glossary file, so
+    tab switches and reruns reuse the same string object rather than a copy
+    """
+    return build_table_html(load_glossary_data(file_data))
+
 def glossary_tab():
     """
     Content for the Glossary tab
@@ -235,66 +383,21 @@ def glossary_tab():
     """
     
     show_header()    
-    df = load_glossary_data(GLOSSARY_DATA)
+    entries = load_glossary_data(GLOSSARY_DATA)
     
-    if df is not None and not df.empty:
-        st.info(f"Glossary contains {len(df)} terms")
+    if entries:
+        st.info(f"Glossary contains {len(entries)} terms")
         
-        # custom-table - simple and effective
-        table_html = """
-            <style>
-                .glossary-table {
-                    width: 100%;
-                    border-collapse: collapse;
-                    font-family: Arial, sans-serif;
-                }
-                .glossary-table th {
-                    background-color: #f0f2f6;
-                    font-weight: bold;
-                    padding: 8px;
-                    text-align: left;
-                    border-bottom: 2px solid #e6e6e6;
-                }
-                .glossary-table td {
-                    padding: 8px;
-                    border-bottom: 1px solid #e6e6e6;
-                    word-wrap: break-word;
-                }
-                .glossary-table tr:nth-child(even) {
-                    background-color: #f8f9fa;
-                }
-                .term-column {
-                    color: darkslategrey;
-                    
-                }
-                .definition-column {
-                    color: slategrey;
-                }
-            </style>
-
-            <table class='glossary-table'>
-                <tr>
-                    <th>Term</th>
-                    <th>Definition</th>
-                </tr>
-            """
-
-        for _, row in df.iterrows():
-            table_html += f"""
-                <tr>
-                    <td class='term-column'>{row['Term']}</td>
-                    <td class='definition-column'>{row['Definition']}</td>
-                </tr>
-            """
-
-        table_html += "</table>"
-        components.html(table_html, height=500, scrolling=True)
+        components.html(glossary_html(GLOSSARY_DATA), height=GLOSSARY_HEIGHT, scrolling=True)
 
     else:
         st.error("⚠️ Could not load glossary data")
 
 def main():
     """Main application function"""           
+    # Page-wide styles, emitted once per run rather than from within a tab
+    st.markdown(MULTISELECT_CSS, unsafe_allow_html=True)
+
     tab_viva, tab_glossary = st.tabs(["🎓:blue[Viva Q&A]", "📖:blue[Glossary]"])
     
     with tab_viva: